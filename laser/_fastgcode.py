@@ -0,0 +1,100 @@
+"""
+Numba-accelerated formatting of G-code linear moves.
+
+Formatting the coordinates of every emitted move is the largest remaining
+cost once parsing and approximation are done. The compiled kernel writes the
+moves of a line chain into a byte buffer; otherwise (or for inputs the kernel
+does not handle) the pure-Python formatter is used. Both produce identical
+output to "%.{precision}f".
+
+The kernel saves about 0.4us per point, but importing Numba and loading the
+compiled kernel costs around half a second, so it only pays off for programs
+of more than a million or so points. It is therefore opt-in: set the
+LASER_USE_NUMBA environment variable to 1 (with Numba installed) to enable it.
+"""
+
+import os
+from collections.abc import Sequence
+from functools import lru_cache
+
+# Whether the Numba kernel may be used, see the module docstring
+USE_NUMBA = os.environ.get("LASER_USE_NUMBA", "").strip().lower() in ("1", "true", "yes")
+
+# Chains shorter than this are not worth the list -> array conversion
+MIN_BATCH_SIZE = 32
+
+# Largest coordinate magnitude (scaled by 10**precision) the kernel formats exactly
+_MAX_SCALED = 2.0 ** 52
+
+# Longest formatted number: sign + 16 integer digits + "." + fraction digits
+_MAX_INTEGER_DIGITS = 17
+
+
+def format_moves_python(command: str, xs: Sequence[float], ys: Sequence[float], precision: int) -> str:
+    """
+    Format consecutive XY moves in pure Python.
+
+    Args:
+        command: Move command, e.g. "G0" or "G1"
+        xs: X coordinates
+        ys: Y coordinates, parallel to xs
+        precision: Number of decimal places
+
+    Returns:
+        Newline separated move commands
+    """
+    template = f"{command} X%.{precision}f Y%.{precision}f;"
+    return "\n".join([template % point for point in zip(xs, ys)])
+
+
+@lru_cache(maxsize=1)
+def _load_kernel():
+    """
+    Import the Numba kernel on first use, so that importing this module (and runs that never format a long chain) don't
+    pay for importing Numba. Returns (numpy, write_moves), or None if Numba is not installed.
+    """
+    try:
+        import numpy as np
+
+        from laser._fastgcode_numba import write_moves
+    except ImportError:  # Numba is optional, fall back to pure Python formatting
+        return None
+
+    return np, write_moves
+
+
+def format_moves(command: str, xs: Sequence[float], ys: Sequence[float], precision: int) -> str:
+    """
+    Format consecutive XY moves, using the compiled kernel when it is enabled and available.
+
+    Args:
+        command: Move command, e.g. "G0" or "G1"
+        xs: X coordinates
+        ys: Y coordinates, parallel to xs
+        precision: Number of decimal places
+
+    Returns:
+        Newline separated move commands
+    """
+    if not USE_NUMBA or len(xs) < MIN_BATCH_SIZE:
+        return format_moves_python(command, xs, ys, precision)
+
+    kernel = _load_kernel()
+    if kernel is None:
+        return format_moves_python(command, xs, ys, precision)
+    np, write_moves = kernel
+
+    x_array = np.asarray(xs, dtype=np.float64)
+    y_array = np.asarray(ys, dtype=np.float64)
+
+    # Non-finite or huge values can't be formatted exactly with int64 arithmetic
+    limit = _MAX_SCALED / 10.0 ** precision
+    if not (np.all(np.abs(x_array) < limit) and np.all(np.abs(y_array) < limit)):
+        return format_moves_python(command, xs, ys, precision)
+
+    prefix = np.frombuffer(command.encode("ascii"), dtype=np.uint8)
+    line_length = len(prefix) + 2 * (3 + _MAX_INTEGER_DIGITS + precision) + 2
+    out = np.empty(line_length * len(x_array), dtype=np.uint8)
+
+    length = write_moves(prefix, x_array, y_array, precision, out)
+    return out[:length].tobytes().decode("ascii")
@@ -0,0 +1,88 @@
+"""
+Numba kernels for laser._fastgcode. This module imports Numba, so it is only imported the first time a chain long
+enough to benefit from the kernel is formatted.
+"""
+
+import math
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, boundscheck=False)
+def write_number(value, precision, scale, out, position):
+    """Write value as '%.{precision}f' at out[position:] and return the new position."""
+    if value < 0.0 or (value == 0.0 and math.copysign(1.0, value) < 0.0):
+        out[position] = 45  # "-"
+        position += 1
+        value = -value
+
+    # Exact product value * scale == product + error (Dekker's two-product)
+    product = value * scale
+    split = 134217729.0 * value
+    value_high = split - (split - value)
+    value_low = value - value_high
+    split = 134217729.0 * scale
+    scale_high = split - (split - scale)
+    scale_low = scale - scale_high
+    error = value_low * scale_low - (((product - value_high * scale_high) - value_low * scale_high)
+                                     - value_high * scale_low)
+
+    # Round half to even on the exact value, as printf does
+    scaled = math.floor(product)
+    remainder = (product - scaled - 0.5) + error
+    digits = np.int64(scaled)
+    if remainder > 0.0 or (remainder == 0.0 and digits % 2 == 1):
+        digits += 1
+
+    divisor = np.int64(1)
+    for _ in range(precision):
+        divisor *= 10
+    integer_part = digits // divisor
+    fraction_part = digits % divisor
+
+    start = position
+    while True:
+        out[position] = 48 + integer_part % 10
+        position += 1
+        integer_part //= 10
+        if integer_part == 0:
+            break
+    end = position - 1
+    while start < end:
+        out[start], out[end] = out[end], out[start]
+        start += 1
+        end -= 1
+
+    if precision > 0:
+        out[position] = 46  # "."
+        position += 1
+        for i in range(precision - 1, -1, -1):
+            out[position + i] = 48 + fraction_part % 10
+            fraction_part //= 10
+        position += precision
+
+    return position
+
+
+@njit(cache=True, boundscheck=False)
+def write_moves(prefix, xs, ys, precision, out):
+    """Write one '<prefix> X.. Y..;' line per point into out and return the number of bytes written."""
+    scale = 10.0 ** precision
+    position = 0
+    for i in range(xs.shape[0]):
+        if i > 0:
+            out[position] = 10  # "\n"
+            position += 1
+        for character in prefix:
+            out[position] = character
+            position += 1
+        out[position] = 32  # " "
+        out[position + 1] = 88  # "X"
+        position = write_number(xs[i], precision, scale, out, position + 2)
+        out[position] = 32  # " "
+        out[position + 1] = 89  # "Y"
+        position = write_number(ys[i], precision, scale, out, position + 2)
+        out[position] = 59  # ";"
+        position += 1
+    return position
@@ -13,8 +13,7 @@ from typing import Optional
 
 # Suppress the "empty body" warning which can be a false positive
 # The warning is checked before curves are added, but the file is generated correctly
-warnings.filterwarnings('ignore', message='.*Compile with an empty body.*')
-warnings.filterwarnings('ignore', category=UserWarning, message='.*empty body.*')
+warnings.filterwarnings('ignore', category=UserWarning, message='Compile with an empty body')
 
 # Add laser directory to path so svg_to_gcode can be imported
 # The svg_to_gcode modules use 'from svg_to_gcode import ...' internally,
@@ -229,20 +228,22 @@ def main(
     else:
         svg_path = Path(svg_file)
         if layer:
-            output_path = svg_path.with_suffix(f"_{layer}.gcode")
+            # with_suffix() rejects suffixes that don't start with a dot
+            output_path = str(svg_path.parent / f"{svg_path.stem}_{layer}.gcode")
         else:
-            output_path = svg_path.with_suffix(".gcode")
+            output_path = str(svg_path.with_suffix(".gcode"))
 
-    # Load header and footer files
-    header = []
+    # Load header and footer files as bytes. Line endings are normalised to the output's "\n" and empty lines are
+    # dropped, like the rest of the program; the result is then copied to the output as is.
+    header_raw_bytes = None
     if header_file:
-        with open(header_file, "r") as f:
-            header = f.read().splitlines()
+        with open(header_file, "rb") as f:
+            header_raw_bytes = b"\n".join([line for line in f.read().splitlines() if line])
 
-    footer = []
+    footer_raw_bytes = None
     if footer_file:
-        with open(footer_file, "r") as f:
-            footer = f.read().splitlines()
+        with open(footer_file, "rb") as f:
+            footer_raw_bytes = b"\n".join([line for line in f.read().splitlines() if line])
 
     # Create configuration
     config = ConversionConfig(
@@ -270,13 +271,13 @@ def main(
         do_laser_off_start=do_laser_off_start,
         do_laser_off_end=do_laser_off_end,
         layer_name=layer,
-        header=header,
-        footer=footer,
+        header_raw_bytes=header_raw_bytes,
+        footer_raw_bytes=footer_raw_bytes,
     )
 
     # Convert
     try:
-        convert_svg_to_gcode(svg_file, str(output_path), config)
+        convert_svg_to_gcode(svg_file, output_path, config)
         click.echo(f"Successfully converted {svg_file} to {output_path}")
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -22,8 +22,7 @@ else:
         tomllib = None  # type: ignore
 
 # Suppress the "empty body" warning which can be a false positive
-warnings.filterwarnings("ignore", message=".*Compile with an empty body.*")
-warnings.filterwarnings("ignore", category=UserWarning, message=".*empty body.*")
+warnings.filterwarnings("ignore", category=UserWarning, message="Compile with an empty body")
 
 # Add laser directory to path so svg_to_gcode can be imported
 laser_dir = Path(__file__).parent
@@ -6,17 +6,20 @@ which can be used by both the Inkscape extension and the CLI tool.
 """
 
 import os
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Union
 from xml.etree import ElementTree
 
 # Import svg_to_gcode - it's in laser/svg_to_gcode/ but when laser/ is in path,
 # we can import it directly as svg_to_gcode
-from svg_to_gcode import TOLERANCES
-from svg_to_gcode.compiler import Compiler
+from svg_to_gcode import set_tolerances
+from svg_to_gcode.compiler import Compiler, OUTPUT_BUFFER_SIZE
 from svg_to_gcode.compiler import interfaces
-from svg_to_gcode.svg_parser import parse_root, parse_file
+from svg_to_gcode.svg_parser import parse_root, parse_file, load_root, NUMBER_RE
 from svg_to_gcode.svg_parser import Transformation
 
+from laser._fastgcode import format_moves
+
 
 def extract_number(input_str: str) -> Optional[float]:
     """
@@ -28,23 +31,18 @@ def extract_number(input_str: str) -> Optional[float]:
     Returns:
         Extracted float value, or None if no number found
     """
-    if not input_str:
-        return None
-
-    num_str = ''
-    for char in input_str:
-        if char.isdigit() or char == '.':
-            num_str += char
-        elif num_str:
-            break
-
-    return float(num_str) if num_str else None
+    match = NUMBER_RE.match(input_str or "")
+    return float(match.group()) if match else None
 
 
+@lru_cache(maxsize=32)
 def generate_custom_interface(laser_off_command: str, laser_power_command: str):
     """
     Generate a custom Gcode interface with custom laser commands.
 
+    Classes are cached per command pair, so repeated conversions with the same
+    commands reuse the same class.
+
     Args:
         laser_off_command: G-code command to turn laser off
         laser_power_command: G-code command to set laser power
@@ -57,12 +55,13 @@ def generate_custom_interface(laser_off_command: str, laser_power_command: str):
 
         def __init__(self):
             super().__init__()
-
-        def laser_off(self):
-            return f"{laser_off_command}"
+            self._laser_off_str = laser_off_command
 
         def set_laser_power(self, _):
-            return f"{laser_power_command}"
+            return laser_power_command
+
+        def _format_moves(self, xs, ys):
+            return format_moves(self._move_command, xs, ys, self.precision)
 
     return CustomInterface
 
@@ -98,6 +97,8 @@ class ConversionConfig:
         layer_name: Optional[str] = None,
         header: Optional[List[str]] = None,
         footer: Optional[List[str]] = None,
+        header_raw_bytes: Optional[bytes] = None,
+        footer_raw_bytes: Optional[bytes] = None,
     ):
         self.unit = unit
         self.travel_speed = travel_speed
@@ -125,6 +126,9 @@ class ConversionConfig:
         self.layer_name = layer_name.strip() if layer_name else None
         self.header = header or []
         self.footer = footer or []
+        # Pre-encoded header/footer file contents, written to the output verbatim before header/footer lines
+        self.header_raw_bytes = header_raw_bytes
+        self.footer_raw_bytes = footer_raw_bytes
 
 
 def get_bed_size(root: ElementTree.Element, config: ConversionConfig) -> tuple[float, float]:
@@ -148,48 +152,80 @@ def get_bed_size(root: ElementTree.Element, config: ConversionConfig) -> tuple[f
         return config.bed_width, config.bed_height
 
 
-def build_transformation(config: ConversionConfig, bed_width: float, bed_height: float) -> Transformation:
+def build_transformation(
+    config: ConversionConfig, bed_width: float, bed_height: float
+) -> Optional[Transformation]:
     """
     Build transformation matrix from configuration.
 
+    Identity operations (zero offsets, unit scale, bottom-left origin) are
+    skipped, so that points are not multiplied by matrices that don't change them.
+
     Args:
         config: Conversion configuration
         bed_width: Bed width
         bed_height: Bed height
 
     Returns:
-        Transformation object
+        Transformation object, or None if the configuration is the identity
     """
     transformation = Transformation()
+    is_identity = True
 
-    transformation.add_translation(config.horizontal_offset, config.vertical_offset)
-    transformation.add_scale(config.scaling_factor)
+    if config.horizontal_offset or config.vertical_offset:
+        transformation.add_translation(config.horizontal_offset, config.vertical_offset)
+        is_identity = False
+    if config.scaling_factor != 1:
+        transformation.add_scale(config.scaling_factor)
+        is_identity = False
 
     if config.machine_origin == "center":
         transformation.add_translation(-bed_width / 2, bed_height / 2)
+        is_identity = False
     elif config.machine_origin == "top-left":
         transformation.add_translation(0, bed_height)
+        is_identity = False
 
-    return transformation
+    return None if is_identity else transformation
 
 
-def build_header_footer(config: ConversionConfig) -> tuple[List[str], List[str]]:
+def _custom_blocks(raw_bytes: Optional[bytes], lines: List[str]) -> List[Union[str, bytes]]:
+    """
+    Build the custom part of a header or footer: the raw bytes, then the non-empty lines
+    joined into a single block. Empty blocks are left out.
+    """
+    blocks: List[Union[str, bytes]] = []
+    if raw_bytes:
+        blocks.append(raw_bytes)
+    joined = "\n".join([line for line in lines if line])
+    if joined:
+        blocks.append(joined)
+    return blocks
+
+
+def build_header_footer(
+    config: ConversionConfig, interface_instance: Optional[interfaces.Gcode] = None
+) -> tuple[List[Union[str, bytes]], List[Union[str, bytes]]]:
     """
     Build header and footer commands from configuration.
 
     Args:
         config: Conversion configuration
+        interface_instance: Interface used to generate stateful commands. Defaults to
+            a new instance of the custom interface for the configured tool commands.
 
     Returns:
-        Tuple of (header, footer) command lists
+        Tuple of (header, footer) command lists. The raw header/footer bytes from
+        the configuration are included as a bytes entry, and the configured
+        header/footer lines are joined into a single entry. Empty blocks are left out.
     """
-    custom_interface = generate_custom_interface(
-        config.tool_off_command, config.tool_power_command
-    )
-    interface_instance = custom_interface()
+    if interface_instance is None:
+        interface_instance = generate_custom_interface(
+            config.tool_off_command, config.tool_power_command
+        )()
 
-    header = list(config.header)
-    footer = list(config.footer)
+    header = _custom_blocks(config.header_raw_bytes, config.header)
+    footer = _custom_blocks(config.footer_raw_bytes, config.footer)
 
     if config.zero_machine:
         header.append(interface_instance.set_origin_at_position())
@@ -199,11 +235,11 @@ def build_header_footer(config: ConversionConfig) -> tuple[List[str], List[str]]
     if config.do_laser_off_end:
         footer.append(interface_instance.laser_off())
 
-    header.append(interface_instance.set_movement_speed(config.travel_speed))
+    # set_movement_speed() only updates interface state, it emits no command
+    interface_instance.set_movement_speed(config.travel_speed)
     if config.do_z_axis_start:
         header.append(interface_instance.linear_move(z=config.z_axis_start))
     if config.move_to_origin_end:
-        footer.append(interface_instance.set_movement_speed(config.travel_speed))
         footer.append(interface_instance.linear_move(x=0, y=0))
 
     return header, footer
@@ -222,48 +258,49 @@ def convert_svg_to_gcode(
         output_path: Path to output G-code file
         config: Conversion configuration
     """
-    # Set approximation tolerance
-    TOLERANCES["approximation"] = config.approximation_tolerance
-
-    # Parse SVG
-    root = ElementTree.parse(svg_path).getroot()
-
-    # Get bed size
-    bed_width, bed_height = get_bed_size(root, config)
-
-    # Build transformation
-    transformation = build_transformation(config, bed_width, bed_height)
-
-    # Parse curves
-    layer_name = config.layer_name
-    curves = parse_root(
-        root,
-        transform_origin=not config.invert_y_axis,
-        root_transformation=transformation,
-        canvas_height=bed_height,
-        layer_name=layer_name,
-    )
-
-    # Build header and footer
-    header, footer = build_header_footer(config)
-
-    # Generate custom interface
-    custom_interface = generate_custom_interface(
-        config.tool_off_command, config.tool_power_command
-    )
-
-    # Create compiler
-    gcode_compiler = Compiler(
-        custom_interface,
-        config.travel_speed,
-        config.cutting_speed,
-        config.pass_depth,
-        dwell_time=config.dwell_time,
-        custom_header=header,
-        custom_footer=footer,
-        unit=config.unit,
-    )
-
-    # Compile to file
-    gcode_compiler.append_curves(curves)
-    gcode_compiler.compile_to_file(output_path, passes=config.passes)
+    # Approximation tolerance is used while curves are parsed and approximated. It is restored afterwards. Tolerances
+    # are global, so conversions running in parallel threads with different tolerances will interfere.
+    with set_tolerances(approximation=config.approximation_tolerance):
+        # Parse SVG
+        root = load_root(svg_path, config.layer_name)
+
+        # Get bed size
+        bed_width, bed_height = get_bed_size(root, config)
+
+        # Build transformation (None when it would be the identity)
+        transformation = build_transformation(config, bed_width, bed_height)
+
+        # Parse curves
+        layer_name = config.layer_name
+        curves = parse_root(
+            root,
+            transform_origin=not config.invert_y_axis,
+            root_transformation=transformation,
+            canvas_height=bed_height,
+            layer_name=layer_name,
+        )
+
+        # Generate custom interface
+        custom_interface = generate_custom_interface(
+            config.tool_off_command, config.tool_power_command
+        )
+
+        # Build header and footer
+        header, footer = build_header_footer(config, custom_interface())
+
+        # Create compiler
+        gcode_compiler = Compiler(
+            custom_interface,
+            config.travel_speed,
+            config.cutting_speed,
+            config.pass_depth,
+            dwell_time=config.dwell_time,
+            custom_header=header,
+            custom_footer=footer,
+            unit=config.unit,
+        )
+
+        # Compile to file
+        gcode_compiler.append_curves(curves)
+        with open(output_path, "wb", buffering=OUTPUT_BUFFER_SIZE) as output_file:
+            gcode_compiler.compile_to_stream(output_file, passes=config.passes)
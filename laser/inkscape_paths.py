@@ -7,16 +7,23 @@ and adds them to sys.path to enable importing the inkex module.
 
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Tuple
 
+# Set once add_inkscape_paths has updated sys.path
+_added = False
 
-def detect_inkscape_paths() -> List[str]:
+
+@lru_cache(maxsize=1)
+def detect_inkscape_paths() -> Tuple[str, ...]:
     """
     Detect Inkscape Python paths across platforms.
 
+    The result is cached, so the filesystem is only checked once per process.
+
     Returns:
-        List of paths to add to sys.path for importing inkex
+        Tuple of paths to add to sys.path for importing inkex
     """
     paths = []
 
@@ -58,15 +65,21 @@ def detect_inkscape_paths() -> List[str]:
         ]
         paths.extend([p for p in windows_paths if os.path.isdir(p)])
 
-    return paths
+    return tuple(paths)
 
 
 def add_inkscape_paths():
     """
     Add detected Inkscape paths to sys.path.
 
-    This function should be called before importing inkex.
+    This function should be called before importing inkex. Calling it again
+    is a no-op.
     """
+    global _added
+    if _added:
+        return
+    _added = True
+
     paths = detect_inkscape_paths()
     for path in paths:
         if path not in sys.path:
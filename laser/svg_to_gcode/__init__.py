@@ -1,2 +1,20 @@
+from contextlib import contextmanager
+
 TOLERANCES = {"approximation": 10 ** -2, "input": 10 ** -3, "operation": 10**-6}
 UNITS = {"mm", "in"}
+
+
+@contextmanager
+def set_tolerances(**tolerances):
+    """
+    Temporarily override tolerances, restoring the previous values on exit. TOLERANCES is global, so the override applies
+    to every thread while the block runs.
+
+    Usage: with set_tolerances(approximation=0.1): ...
+    """
+    previous = {key: TOLERANCES[key] for key in tolerances}
+    TOLERANCES.update(tolerances)
+    try:
+        yield
+    finally:
+        TOLERANCES.update(previous)
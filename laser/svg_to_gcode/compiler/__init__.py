@@ -1,3 +1,3 @@
 """The compiler sub-module transforms geometric Curves into CAM machine code."""
 
-from svg_to_gcode.compiler._compiler import Compiler
+from svg_to_gcode.compiler._compiler import Compiler, OUTPUT_BUFFER_SIZE
@@ -6,6 +6,9 @@ from svg_to_gcode.geometry import Curve, Line
 from svg_to_gcode.geometry import LineSegmentChain
 from svg_to_gcode import UNITS, TOLERANCES
 
+# Large output buffer so multi-MB programs are written with few system calls
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
 
 class Compiler:
     """
@@ -25,6 +28,9 @@ class Compiler:
         :param unit: specify a unit to the machine
         :param custom_header: A list of commands to be executed before all generated commands. Default is [laser_off,]
         :param custom_footer: A list of commands to be executed after all generated commands. Default is [laser_off,]
+
+        Entries of custom_header and custom_footer may also be pre-encoded bytes blocks (eg. the contents of a header
+        file), which compile_to_stream writes verbatim.
         """
         self.interface = interface_class()
         self.movement_speed = movement_speed
@@ -57,6 +63,47 @@ class Compiler:
         :param passes: the number of passes that should be made. Every pass the machine moves_down (z-axis) by
         self.pass_depth and self.body is repeated.
         :return returns the assembled code. self.header + [self.body, -self.pass_depth] * passes + self.footer
+
+        Bytes blocks from the custom header or footer are decoded as utf-8, with surrogateescape for any other bytes, so
+        that code.encode(errors="surrogateescape") gives exactly the output of compile_to_stream.
+        """
+
+        return '\n'.join(code.decode(errors="surrogateescape") if isinstance(code, bytes) else code
+                         for code in self._assemble(passes))
+
+    def compile_to_file(self, file_name: str, passes=1):
+        """
+        A wrapper for the self.compile_to_stream method. Assembles the code in the header, body and footer, saving it to
+        a file.
+
+        :param file_name: the path to save the file.
+        :param passes: the number of passes that should be made. Every pass the machine moves_down (z-axis) by
+        self.pass_depth and self.body is repeated.
+        """
+
+        with open(file_name, 'wb', buffering=OUTPUT_BUFFER_SIZE) as file:
+            self.compile_to_stream(file, passes=passes)
+
+    def compile_to_stream(self, stream: typing.BinaryIO, passes=1):
+        """
+        Assembles the code in the header, body and footer, writing it to an already open binary stream. The output is
+        identical to self.compile, but the program is never held in memory as a whole.
+
+        :param stream: a binary file-like object to write the encoded code to.
+        :param passes: the number of passes that should be made. Every pass the machine moves_down (z-axis) by
+        self.pass_depth and self.body is repeated.
+        """
+
+        separator = b''
+        for code in self._assemble(passes):
+            stream.write(separator)
+            stream.write(code if isinstance(code, bytes) else code.encode(errors="surrogateescape"))
+            separator = b'\n'
+
+    def _assemble(self, passes):
+        """
+        Yields the non-empty pieces of code making up the program, in order. Pieces must be joined with newlines. Pieces
+        are str, except for bytes blocks passed in the custom header or footer.
         """
 
         if len(self.body) == 0:
@@ -64,10 +111,13 @@ class Compiler:
 
         gcode = []
 
+        # Every pass replays the same body, so it is assembled once and reused
+        body = '\n'.join([command for command in self.body if command])
+
         gcode.extend(self.header)
         gcode.append(self.interface.set_unit(self.unit))
         for i in range(passes):
-            gcode.extend(self.body)
+            gcode.append(body)
 
             if i < passes - 1:  # If it isn't the last pass, turn off the laser and move down
                 gcode.append(self.interface.laser_off())
@@ -79,26 +129,13 @@ class Compiler:
 
         gcode.extend(self.footer)
 
-        gcode = filter(lambda command: len(command) > 0, gcode)
-
-        return '\n'.join(gcode)
-
-    def compile_to_file(self, file_name: str, passes=1):
-        """
-        A wrapper for the self.compile method. Assembles the code in the header, body and footer, saving it to a file.
-
-        :param file_name: the path to save the file.
-        :param passes: the number of passes that should be made. Every pass the machine moves_down (z-axis) by
-        self.pass_depth and self.body is repeated.
-        """
-
-        with open(file_name, 'w') as file:
-            file.write(self.compile(passes=passes))
+        return filter(lambda command: len(command) > 0, gcode)
 
     def append_line_chain(self, line_chain: LineSegmentChain):
         """
-        Draws a LineSegmentChain by calling interface.linear_move() for each segment. The resulting code is appended to
-        self.body
+        Draws a LineSegmentChain by calling interface.linear_move_batch() with the segment end points. The resulting
+        code is appended to self.body as a single newline separated block, so the body holds one entry per chain rather
+        than per command.
         """
 
         if line_chain.chain_size() == 0:
@@ -119,10 +156,13 @@ class Compiler:
             if self.dwell_time > 0:
                 code = [self.interface.dwell(self.dwell_time)] + code
 
-        for line in line_chain:
-            code.append(self.interface.linear_move(line.end.x, line.end.y))
+        # Coordinates are gathered into parallel lists so the interface can format the whole chain in one call
+        ends = [line.end for line in line_chain]
+        code.append(self.interface.linear_move_batch([end.x for end in ends], [end.y for end in ends]))
 
-        self.body.extend(code)
+        block = '\n'.join(command for command in code if command)
+        if block:
+            self.body.append(block)
 
     def append_curves(self, curves: [typing.Type[Curve]]):
         """
@@ -71,6 +71,17 @@ class Interface:
         raise NotImplementedError("Interface class must implement the set_relative_coordinates command")
 
     # Optional commands #
+    def linear_move_batch(self, xs, ys) -> str:
+        """
+        Optional method, if implemented moves the tool in straight lines through consecutive points more efficiently
+        than repeated linear_move calls. The default implementation simply calls linear_move for every point.
+
+        :param xs: the x coordinates of the points.
+        :param ys: the y coordinates of the points, parallel to xs.
+        :return: Appropriate commands, separated by newlines.
+        """
+        return '\n'.join(self.linear_move(x, y) for x, y in zip(xs, ys))
+
     def dwell(self, milliseconds) -> str:
         """
         Optional method, if implemented dwells for a determined number of milliseconds before moving to the next command.
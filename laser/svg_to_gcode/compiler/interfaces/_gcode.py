@@ -1,5 +1,5 @@
-import warnings
 import math
+from functools import lru_cache
 
 from svg_to_gcode import formulas
 from svg_to_gcode.compiler.interfaces import Interface
@@ -8,27 +8,68 @@ from svg_to_gcode import TOLERANCES
 
 verbose = False
 
+_UNIT_COMMANDS = {"mm": "G21;", "in": "G20;"}
+
+
+@lru_cache(maxsize=8)
+def _precision_for(tolerance):
+    """Number of decimal places matching the significant figures of a tolerance."""
+    return abs(round(math.log10(tolerance)))
+
 
 class Gcode(Interface):
 
     def __init__(self):
-        self.position = None
+        # The current position is stored as two scalars; a Vector is only built when position is read
+        self._pos_x = None
+        self._pos_y = None
         self._next_speed = None
         self._current_speed = None
+        self._speed_changed = False  # Set when _next_speed differs from the last speed used by a move
         self._is_travel_move = False  # Track if we're in travel mode (G0) or cutting mode (G1)
+        self._move_command = "G1"
+
+        # Laser commands are cached; single-power jobs request the same power before every cut
+        self._laser_off_str = "M5;"
+        self._laser_power = None
+        self._laser_power_str = None
 
         # Round outputs to the same number of significant figures as the operational tolerance.
-        self.precision = abs(round(math.log(TOLERANCES["operation"], 10)))
+        self.precision = _precision_for(TOLERANCES["operation"])
+
+        # Format templates are built once so linear_move doesn't re-parse the precision spec on every call
+        self._x_format = f" X{{:.{self.precision}f}}"
+        self._y_format = f" Y{{:.{self.precision}f}}"
+        self._z_format = f" Z{{:.{self.precision}f}}"
+        self._xy_format = f" X%.{self.precision}f Y%.{self.precision}f;"
+
+    @property
+    def position(self):
+        if self._pos_x is None:
+            return None
+
+        return Vector(self._pos_x, self._pos_y)
+
+    @position.setter
+    def position(self, vector):
+        if vector is None:
+            self._pos_x = self._pos_y = None
+        else:
+            self._pos_x, self._pos_y = vector.x, vector.y
 
     def set_movement_speed(self, speed):
         self._next_speed = speed
+        self._speed_changed = speed != self._current_speed
         self._is_travel_move = True  # Movement speed indicates travel mode (G0)
+        self._move_command = "G0"
         return ''
     
     def set_cutting_speed(self, speed):
         """Set cutting speed and clear travel mode flag (switches to G1 mode)"""
         self._next_speed = speed
+        self._speed_changed = speed != self._current_speed
         self._is_travel_move = False  # Cutting speed indicates cutting mode (G1)
+        self._move_command = "G1"
         return ''
 
     def linear_move(self, x=None, y=None, z=None):
@@ -38,50 +79,91 @@ class Gcode(Interface):
 
         # Don't do anything if linear move was called without passing a value.
         if x is None and y is None and z is None:
-            warnings.warn("linear_move command invoked without arguments.")
             return ''
 
         # Use G0 for travel moves (rapid positioning, laser off), G1 for cutting moves (with feedrate)
-        if self._is_travel_move:
-            command = "G0"  # Rapid positioning - no feedrate, laser should be off
-        else:
-            command = "G1"  # Linear interpolation with feedrate for cutting
-            if self._current_speed != self._next_speed:
-                self._current_speed = self._next_speed
-                command += f" F{self._current_speed}"
-        
-        # Update current speed for travel moves too (for tracking, but don't output F parameter)
-        if self._is_travel_move and self._current_speed != self._next_speed:
-            self._current_speed = self._next_speed
+        prefix = self._move_command
 
-        # Move if not 0 and not None
-        command += f" X{x:.{self.precision}f}" if x is not None else ''
-        command += f" Y{y:.{self.precision}f}" if y is not None else ''
-        command += f" Z{z:.{self.precision}f}" if z is not None else ''
+        # Speed is tracked for travel moves too, but only cutting moves output the F parameter
+        if self._speed_changed:
+            self._current_speed = self._next_speed
+            self._speed_changed = False
+            if not self._is_travel_move:
+                prefix = f"{prefix} F{self._current_speed}"
 
-        if self.position is not None or (x is not None and y is not None):
+        # Move if not 0 and not None. XY moves, by far the most common, are built with a single format operation.
+        if z is None and x is not None and y is not None:
+            command = prefix + self._xy_format % (x, y)
+        else:
+            parts = [prefix]
+            if x is not None:
+                parts.append(self._x_format.format(x))
+            if y is not None:
+                parts.append(self._y_format.format(y))
+            if z is not None:
+                parts.append(self._z_format.format(z))
+            parts.append(';')
+            command = ''.join(parts)
+
+        if self._pos_x is not None or (x is not None and y is not None):
             if x is None:
-                x = self.position.x
+                x = self._pos_x
 
             if y is None:
-                y = self.position.y
+                y = self._pos_y
 
-            self.position = Vector(x, y)
+            self._pos_x = x
+            self._pos_y = y
 
         if verbose:
             print(f"Move to {x}, {y}, {z}")
 
-        return command + ';'
+        return command
+
+    def linear_move_batch(self, xs, ys):
+        """Move through consecutive points given as parallel sequences of x and y coordinates."""
+        # Subclasses overriding linear_move must see every move, so they get the per-point default
+        if type(self).linear_move is not Gcode.linear_move:
+            return super().linear_move_batch(xs, ys)
+
+        if not xs:
+            return ''
+
+        # The first move handles speed bookkeeping and validation
+        command = self.linear_move(xs[0], ys[0])
+        if len(xs) == 1:
+            return command
+
+        command += '\n' + self._format_moves(xs[1:], ys[1:])
+
+        self._pos_x = xs[-1]
+        self._pos_y = ys[-1]
+
+        if verbose:
+            for x, y in zip(xs[1:], ys[1:]):
+                print(f"Move to {x}, {y}, None")
+
+        return command
+
+    def _format_moves(self, xs, ys):
+        """Format XY moves in the current movement mode. Speed changes must already have been emitted."""
+        template = self._move_command + self._xy_format
+        return '\n'.join([template % point for point in zip(xs, ys)])
 
     def laser_off(self):
-        return f"M5;"
+        return self._laser_off_str
 
     def set_laser_power(self, power):
+        if power == self._laser_power:
+            return self._laser_power_str
+
         if power < 0 or power > 1:
             raise ValueError(f"{power} is out of bounds. Laser power must be given between 0 and 1. "
                              f"The interface will scale it correctly.")
 
-        return f"M3 S{formulas.linear_map(0, 255, power)};"
+        self._laser_power = power
+        self._laser_power_str = f"M3 S{formulas.linear_map(0, 255, power)};"
+        return self._laser_power_str
 
     def set_absolute_coordinates(self):
         return "G90;"
@@ -93,17 +175,12 @@ class Gcode(Interface):
         return f"G4 P{milliseconds}"
 
     def set_origin_at_position(self):
-        self.position = Vector(0, 0)
+        self._pos_x = 0
+        self._pos_y = 0
         return "G92 X0 Y0 Z0;"
 
     def set_unit(self, unit):
-        if unit == "mm":
-            return "G21;"
-
-        if unit == "in":
-            return "G20;"
-
-        return ''
+        return _UNIT_COMMANDS.get(unit, '')
 
     def home_axes(self):
         return "G28;"
@@ -23,6 +23,15 @@ class Matrix:
 
         self.matrix_list = matrix_list
 
+    def copy(self) -> "Matrix":
+        """Return a copy of the matrix. The rows are copied, the (already validated) values are not checked again."""
+        matrix = Matrix.__new__(Matrix)
+        matrix.number_of_rows = self.number_of_rows
+        matrix.number_of_columns = self.number_of_columns
+        matrix.matrix_list = [list(row) for row in self.matrix_list]
+
+        return matrix
+
     def __repr__(self):
         matrix_str = "\n       ".join([str(row) for row in self])
         return f"Matrix({matrix_str})"
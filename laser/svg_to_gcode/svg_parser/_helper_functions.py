@@ -42,7 +42,7 @@ def parse_root(root: ElementTree.Element, canvas_height=None, transform=True, dr
             curves.extend(path.curves)
     else:
         # Draw visible elements (Depth-first search)
-        for element in list(root):
+        for element in root:
 
             # display cannot be overridden by inheritance. Just skip the element
             if _has_style(element, "display", "none"):
@@ -1,33 +1,297 @@
-from xml.etree import ElementTree
+from functools import lru_cache
 from typing import List, Optional
-from copy import deepcopy
 import math
+import re
 
+try:
+    from lxml import etree as ElementTree
+    _lxml = True
+except ImportError:  # lxml is optional, fall back to the (slower) standard library parser
+    from xml.etree import ElementTree
+    _lxml = False
+
+from svg_to_gcode import TOLERANCES
 from svg_to_gcode.svg_parser import Path, Transformation
 from svg_to_gcode.geometry import Curve
 
-NAMESPACES = {'svg': 'http://www.w3.org/2000/svg'}
+NAMESPACES = {'svg': 'http://www.w3.org/2000/svg',
+              'inkscape': 'http://www.inkscape.org/namespaces/inkscape',
+              'sodipodi': 'http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd'}
+
+# Namespaced tags and attributes are built once instead of for every element
+SVG_PATH_TAG = "{%s}path" % NAMESPACES["svg"]
+SVG_DEFS_TAG = "{%s}defs" % NAMESPACES["svg"]
+INK_GROUPMODE = "{%s}groupmode" % NAMESPACES["inkscape"]
+INK_LABEL = "{%s}label" % NAMESPACES["inkscape"]
+
+# Elements whose subtrees never produce curves. They are cleared while files are loaded, and skipped by parse_root.
+_NON_RENDERING_TAGS = frozenset([SVG_DEFS_TAG,
+                                 "{%s}metadata" % NAMESPACES["svg"],
+                                 "{%s}title" % NAMESPACES["svg"],
+                                 "{%s}desc" % NAMESPACES["svg"],
+                                 "{%s}style" % NAMESPACES["svg"],
+                                 "{%s}script" % NAMESPACES["svg"],
+                                 "{%s}namedview" % NAMESPACES["sodipodi"]])
+
+# Leading number of an attribute value, eg. "10" in "10px"
+NUMBER_RE = re.compile(r"\s*[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+# Control point distance, relative to the radius, of a cubic bezier approximating a quarter circle
+_BEZIER_CIRCLE_KAPPA = 0.5522847498307936
+
+# Upper bound on the beziers per quarter of a circle or ellipse; 64 keep the error below 1e-12 of the radius
+_MAX_BEZIERS_PER_QUARTER = 64
+
+# Separators between the coordinates of a points attribute
+_POINTS_SPLIT_RE = re.compile(r"[,\s]+")
+
+# Parser options for lxml. Comments and processing instructions are dropped so that parse_root only sees elements.
+# Entities are not resolved and nothing is fetched from the network, so an svg can't pull in local or remote files
+# (the standard library parser doesn't fetch external entities either).
+_LXML_OPTIONS = dict(huge_tree=True, remove_blank_text=True, remove_comments=True, remove_pis=True, collect_ids=False,
+                     resolve_entities=False, no_network=True)
 
+# Finds any descendant that parse_root would treat differently from a plain path in a document without transforms:
+# display or visibility settings, basic shapes (matched by local name, as in _shape_to_path_data) and paths inside
+# non-rendering elements. Documents without any can be drawn by iterating over their paths in C. Only available with
+# lxml.
+if _lxml:
+    _FAST_PATH_BLOCKERS = ElementTree.XPath(
+        "boolean("
+        ".//*[@display or @visibility"
+        " or contains(@style, 'display') or contains(@style, 'visibility')"
+        " or local-name() = 'circle' or local-name() = 'ellipse' or local-name() = 'rect'"
+        " or local-name() = 'line' or local-name() = 'polyline' or local-name() = 'polygon']"
+        " | .//*[self::svg:defs or self::svg:metadata or self::svg:title or self::svg:desc or self::svg:style"
+        " or self::svg:script or self::sodipodi:namedview]//svg:path"
+        ")", namespaces=NAMESPACES)
 
-def _has_style(element: ElementTree.Element, key: str, value: str) -> bool:
+
+def _parse_style(element: ElementTree.Element) -> dict:
+    """Parse an element's style attribute into a dictionary of declarations. Returns an empty dict if there is none."""
+    style = element.get("style")
+    if not style:
+        return {}
+
+    declarations = {}
+    for item in style.split(';'):
+        key, separator, value = item.partition(':')
+        if separator:
+            declarations[key.strip()] = value.strip()
+    return declarations
+
+
+def _get_style(element: ElementTree.Element, style: dict, key: str) -> Optional[str]:
     """
-    Check if an element contains a specific key and value either as an independent attribute or in the style attribute.
+    Get the value of a style property, either from the parsed style attribute or from an independent attribute. The
+    style attribute takes precedence, as in CSS.
     """
-    return element.get(key) == value or (element.get("style") and f"{key}:{value}" in element.get("style"))
+    return style.get(key) or element.get(key)
 
 
 def _get_float_attr(element: ElementTree.Element, attr: str, default: float = 0.0) -> float:
-    """Get a float attribute value, handling units."""
+    """
+    Get a float attribute value, ignoring any unit suffix. element may also be a dict of attribute values, as used for
+    cached shapes.
+    """
     value = element.get(attr)
     if value is None:
         return default
-    # Remove units if present
-    if value.endswith('px') or value.endswith('pt') or value.endswith('mm') or value.endswith('in'):
-        value = value[:-2]
+
+    # Most values are plain numbers, which float() parses directly. The regex is only needed for unit suffixes.
     try:
         return float(value)
     except ValueError:
-        return default
+        match = NUMBER_RE.match(value)
+        return float(match.group()) if match else default
+
+
+def _points_to_path_data(points: str, closed: bool) -> Optional[str]:
+    """
+    Convert the points attribute of a polyline or polygon to path data. Returns None if there are less than two points.
+    A trailing unpaired coordinate is ignored.
+    """
+    if not points:
+        return None
+
+    coords = []
+    for part in _POINTS_SPLIT_RE.split(points.strip()):
+        try:
+            coords.append(float(part))
+        except ValueError:
+            continue
+
+    if len(coords) < 4:
+        return None
+
+    # Build the path in a list and join once, rather than growing a string point by point
+    parts = [f"M {coords[0]},{coords[1]}"]
+    parts.extend([f"L {x},{y}" for x, y in zip(coords[2::2], coords[3::2])])
+    if closed:
+        parts.append("Z")
+
+    return " ".join(parts)
+
+
+def _bezier_arc_error(angle: float) -> float:
+    """Largest radial error, relative to the radius, of the standard cubic bezier approximation of a circular arc."""
+    return 2 * math.sin(angle / 4) ** 6 / (27 * math.cos(angle / 4) ** 2)
+
+
+def _ellipse_path_data(cx: float, cy: float, rx: float, ry: float) -> str:
+    """
+    Path data for an axis aligned ellipse as cubic beziers, starting at the leftmost point and drawn in the same
+    direction as the equivalent "A rx,ry 0 1,1" arcs. Beziers are much cheaper to parse and approximate than arcs.
+
+    Each quarter is split into as many beziers as needed for their deviation from the true ellipse to stay within a
+    tenth of the approximation tolerance, which leaves the rest of the tolerance to the line segment approximation.
+    """
+    # The ellipse is the image of the unit circle under (u, v) -> (cx + rx * u, cy + ry * v), so the error is at most
+    # the unit circle's, scaled by the larger radius.
+    max_error = TOLERANCES["approximation"] / 10
+    radius = max(rx, ry)
+    segments = 1
+    while segments < _MAX_BEZIERS_PER_QUARTER and radius * _bezier_arc_error(math.pi / 2 / segments) > max_error:
+        segments += 1
+
+    if segments == 1:
+        kappa = _BEZIER_CIRCLE_KAPPA
+    else:
+        kappa = 4 / 3 * math.tan(math.pi / 8 / segments)
+
+    # Unit points of the first quarter, from the left point to the top one (negative y is up in svg). The end points
+    # are exact, so quarters meet exactly.
+    points = [(-1.0, 0.0)]
+    for i in range(1, segments):
+        angle = math.pi / 2 * i / segments
+        points.append((-math.cos(angle), -math.sin(angle)))
+    points.append((-0.0, -1.0))
+    # Unit tangents in the drawing direction
+    tangents = [(-y, x) for x, y in points]
+
+    def coordinates(u, v):
+        return f"{cx + rx * u},{cy + ry * v}"
+
+    start = coordinates(*points[0])
+    tokens = ["M", start]
+    for quarter in range(4):
+        for i in range(segments):
+            (x0, y0), (tx0, ty0) = points[i], tangents[i]
+            (x1, y1), (tx1, ty1) = points[i + 1], tangents[i + 1]
+            end = start if quarter == 3 and i == segments - 1 else coordinates(x1, y1)
+            tokens.extend(("C", coordinates(x0 + kappa * tx0, y0 + kappa * ty0),
+                           coordinates(x1 - kappa * tx1, y1 - kappa * ty1), end))
+        # The next quarter is this one rotated by 90 degrees in the drawing direction
+        points = [(-y, x) for x, y in points]
+        tangents = [(-y, x) for x, y in tangents]
+    tokens.append("Z")
+
+    return " ".join(tokens)
+
+
+def _circle_to_path(element: ElementTree.Element) -> Optional[str]:
+    cx = _get_float_attr(element, 'cx', 0)
+    cy = _get_float_attr(element, 'cy', 0)
+    r = _get_float_attr(element, 'r', 0)
+    if r <= 0:
+        return None
+
+    return _ellipse_path_data(cx, cy, r, r)
+
+
+def _ellipse_to_path(element: ElementTree.Element) -> Optional[str]:
+    cx = _get_float_attr(element, 'cx', 0)
+    cy = _get_float_attr(element, 'cy', 0)
+    rx = _get_float_attr(element, 'rx', 0)
+    ry = _get_float_attr(element, 'ry', 0)
+    if rx <= 0 or ry <= 0:
+        return None
+
+    return _ellipse_path_data(cx, cy, rx, ry)
+
+
+def _rect_to_path(element: ElementTree.Element) -> Optional[str]:
+    x = _get_float_attr(element, 'x', 0)
+    y = _get_float_attr(element, 'y', 0)
+    width = _get_float_attr(element, 'width', 0)
+    height = _get_float_attr(element, 'height', 0)
+    rx = _get_float_attr(element, 'rx', 0)
+    ry = _get_float_attr(element, 'ry', 0)
+
+    if width <= 0 or height <= 0:
+        return None
+
+    # Handle rounded rectangles
+    if rx > 0 or ry > 0:
+        if ry == 0:
+            ry = rx
+        if rx == 0:
+            rx = ry
+        rx = min(rx, width / 2)
+        ry = min(ry, height / 2)
+        # Corner coordinates, each computed once
+        x1 = x + rx
+        x2 = x + width - rx
+        x3 = x + width
+        y1 = y + ry
+        y2 = y + height - ry
+        y3 = y + height
+        # Rounded rectangle path. Repeated tokens are formatted once and joined.
+        start = f"{x1},{y}"
+        arc = f"A {rx},{ry} 0 0,1"
+        return " ".join(("M", start,
+                         "L", f"{x2},{y}", arc, f"{x3},{y1}",
+                         "L", f"{x3},{y2}", arc, f"{x2},{y3}",
+                         "L", f"{x1},{y3}", arc, f"{x},{y2}",
+                         "L", f"{x},{y1}", arc, start, "Z"))
+
+    # Simple rectangle
+    left, top, right, bottom = str(x), str(y), str(x + width), str(y + height)
+    return " ".join(("M", left + "," + top, "L", right + "," + top, "L", right + "," + bottom,
+                     "L", left + "," + bottom, "Z"))
+
+
+def _line_to_path(element: ElementTree.Element) -> str:
+    x1 = _get_float_attr(element, 'x1', 0)
+    y1 = _get_float_attr(element, 'y1', 0)
+    x2 = _get_float_attr(element, 'x2', 0)
+    y2 = _get_float_attr(element, 'y2', 0)
+    return f"M {x1},{y1} L {x2},{y2}"
+
+
+def _polyline_to_path(element: ElementTree.Element) -> Optional[str]:
+    return _points_to_path_data(element.get('points', ''), closed=False)
+
+
+def _polygon_to_path(element: ElementTree.Element) -> Optional[str]:
+    return _points_to_path_data(element.get('points', ''), closed=True)
+
+
+# Path data converters for basic shapes, by local tag name
+_SHAPE_HANDLERS = {'circle': _circle_to_path,
+                   'ellipse': _ellipse_to_path,
+                   'rect': _rect_to_path,
+                   'line': _line_to_path,
+                   'polyline': _polyline_to_path,
+                   'polygon': _polygon_to_path}
+
+
+# Geometry attributes of the shapes whose path data is cached. Documents often repeat identical shapes (grids, part
+# libraries), so these are memoized on their geometry alone; ids and styles don't affect the path. Polylines and
+# polygons are not cached, their points can be arbitrarily long.
+_CACHED_SHAPE_ATTRIBUTES = {'circle': ('cx', 'cy', 'r'),
+                            'ellipse': ('cx', 'cy', 'rx', 'ry'),
+                            'rect': ('x', 'y', 'width', 'height', 'rx', 'ry'),
+                            'line': ('x1', 'y1', 'x2', 'y2')}
+
+
+@lru_cache(maxsize=4096)
+def _cached_shape_path_data(tag: str, values: tuple, tolerance: float) -> Optional[str]:
+    """
+    Path data of a shape, given the values of its _CACHED_SHAPE_ATTRIBUTES (None for missing attributes). tolerance is
+    the current approximation tolerance; it is part of the cache key because circle and ellipse paths depend on it.
+    """
+    return _SHAPE_HANDLERS[tag](dict(zip(_CACHED_SHAPE_ATTRIBUTES[tag], values)))
 
 
 def _shape_to_path_data(element: ElementTree.Element) -> Optional[str]:
@@ -35,106 +299,20 @@ def _shape_to_path_data(element: ElementTree.Element) -> Optional[str]:
     Convert SVG shape elements (circle, rect, ellipse, line, polyline, polygon) to path data.
     Returns path data string or None if element is not a supported shape.
     """
-    tag = element.tag.split('}')[-1] if '}' in element.tag else element.tag
-    svg_ns = NAMESPACES['svg']
-    
-    if tag == 'circle':
-        cx = _get_float_attr(element, 'cx', 0)
-        cy = _get_float_attr(element, 'cy', 0)
-        r = _get_float_attr(element, 'r', 0)
-        if r <= 0:
-            return None
-        # Circle as path: M cx-r,cy A r,r 0 1,1 cx+r,cy A r,r 0 1,1 cx-r,cy
-        return f"M {cx-r},{cy} A {r},{r} 0 1,1 {cx+r},{cy} A {r},{r} 0 1,1 {cx-r},{cy} Z"
-    
-    elif tag == 'ellipse':
-        cx = _get_float_attr(element, 'cx', 0)
-        cy = _get_float_attr(element, 'cy', 0)
-        rx = _get_float_attr(element, 'rx', 0)
-        ry = _get_float_attr(element, 'ry', 0)
-        if rx <= 0 or ry <= 0:
-            return None
-        # Ellipse as path: M cx-rx,cy A rx,ry 0 1,1 cx+rx,cy A rx,ry 0 1,1 cx-rx,cy
-        return f"M {cx-rx},{cy} A {rx},{ry} 0 1,1 {cx+rx},{cy} A {rx},{ry} 0 1,1 {cx-rx},{cy} Z"
-    
-    elif tag == 'rect':
-        x = _get_float_attr(element, 'x', 0)
-        y = _get_float_attr(element, 'y', 0)
-        width = _get_float_attr(element, 'width', 0)
-        height = _get_float_attr(element, 'height', 0)
-        rx = _get_float_attr(element, 'rx', 0)
-        ry = _get_float_attr(element, 'ry', 0)
-        
-        if width <= 0 or height <= 0:
-            return None
-        
-        # Handle rounded rectangles
-        if rx > 0 or ry > 0:
-            if ry == 0:
-                ry = rx
-            if rx == 0:
-                rx = ry
-            rx = min(rx, width / 2)
-            ry = min(ry, height / 2)
-            # Rounded rectangle path
-            return (f"M {x+rx},{y} "
-                   f"L {x+width-rx},{y} "
-                   f"A {rx},{ry} 0 0,1 {x+width},{y+ry} "
-                   f"L {x+width},{y+height-ry} "
-                   f"A {rx},{ry} 0 0,1 {x+width-rx},{y+height} "
-                   f"L {x+rx},{y+height} "
-                   f"A {rx},{ry} 0 0,1 {x},{y+height-ry} "
-                   f"L {x},{y+ry} "
-                   f"A {rx},{ry} 0 0,1 {x+rx},{y} Z")
-        else:
-            # Simple rectangle
-            return f"M {x},{y} L {x+width},{y} L {x+width},{y+height} L {x},{y+height} Z"
-    
-    elif tag == 'line':
-        x1 = _get_float_attr(element, 'x1', 0)
-        y1 = _get_float_attr(element, 'y1', 0)
-        x2 = _get_float_attr(element, 'x2', 0)
-        y2 = _get_float_attr(element, 'y2', 0)
-        return f"M {x1},{y1} L {x2},{y2}"
-    
-    elif tag == 'polyline':
-        points = element.get('points', '')
-        if not points:
-            return None
-        # Parse points and create path
-        coords = []
-        for part in points.replace(',', ' ').split():
-            try:
-                coords.append(float(part))
-            except ValueError:
-                continue
-        if len(coords) < 4:
-            return None
-        path_data = f"M {coords[0]},{coords[1]}"
-        for i in range(2, len(coords), 2):
-            path_data += f" L {coords[i]},{coords[i+1]}"
-        return path_data
-    
-    elif tag == 'polygon':
-        points = element.get('points', '')
-        if not points:
-            return None
-        # Parse points and create closed path
-        coords = []
-        for part in points.replace(',', ' ').split():
-            try:
-                coords.append(float(part))
-            except ValueError:
-                continue
-        if len(coords) < 4:
-            return None
-        path_data = f"M {coords[0]},{coords[1]}"
-        for i in range(2, len(coords), 2):
-            path_data += f" L {coords[i]},{coords[i+1]}"
-        path_data += " Z"
-        return path_data
-    
-    return None
+    tag = element.tag
+    if not isinstance(tag, str):  # lxml comments and processing instructions
+        return None
+
+    tag = tag.rpartition('}')[2]
+
+    attributes = _CACHED_SHAPE_ATTRIBUTES.get(tag)
+    if attributes is not None:
+        get = element.get
+        return _cached_shape_path_data(tag, tuple([get(attribute) for attribute in attributes]),
+                                       TOLERANCES["approximation"])
+
+    handler = _SHAPE_HANDLERS.get(tag)
+    return handler(element) if handler else None
 
 
 # Todo deal with viewBoxes
@@ -142,9 +320,9 @@ def parse_root(root: ElementTree.Element, transform_origin=True, canvas_height=N
                visible_root=True, root_transformation=None, layer_name=None) -> List[Curve]:
 
     """
-    Recursively parse an etree root's children into geometric curves.
+    Parse an etree root's descendants into geometric curves, depth-first.
 
-    :param root: The etree element who's children should be recursively parsed. The root will not be drawn.
+    :param root: The etree element who's descendants should be parsed. The root will not be drawn.
     :param canvas_height: The height of the canvas. By default the height attribute of the root is used. If the root
     does not contain the height attribute, it must be either manually specified or transform must be False.
     :param transform_origin: Whether or not to transform input coordinates from the svg coordinate system to standard
@@ -157,96 +335,165 @@ def parse_root(root: ElementTree.Element, transform_origin=True, canvas_height=N
     """
 
     if canvas_height is None:
-        height_str = root.get("height")
-        canvas_height = float(height_str) if height_str.isnumeric() else float(height_str[:-2])
+        # Decimal heights and any unit suffix are accepted, eg. "100", "100.5" or "100mm"
+        match = NUMBER_RE.match(root.get("height") or "")
+        if match is None:
+            raise ValueError("The root has no numeric height attribute. Please specify canvas_height manually.")
+        canvas_height = float(match.group())
 
     curves = []
 
-    # Check if this element is a layer and if we should process it
-    inkscape_ns = "http://www.inkscape.org/namespaces/inkscape"
-    is_layer = root.get(f"{{{inkscape_ns}}}groupmode") == "layer"
-    layer_label = root.get(f"{{{inkscape_ns}}}label")
-    
-    # Track if we're inside the target layer (for recursive calls)
-    inside_target_layer = False
-    should_recurse = True
-    
-    if layer_name is not None:
-        # If this is a layer
-        if is_layer:
-            # If it matches the target layer, we're now inside it
-            if layer_label == layer_name:
-                inside_target_layer = True
-                should_recurse = True  # Process this layer and its children
-            else:
-                # This layer doesn't match, skip it and all its children
-                return curves
-        else:
-            # We're not in a layer yet, but layer_name is specified
-            # We need to recurse to find matching layers
-            # Don't process paths at this level, but do recurse
-            inside_target_layer = False
-            should_recurse = True
-    else:
-        # No layer filtering, process everything
-        inside_target_layer = True
-        should_recurse = True
+    # Many documents have no transform attributes at all. find() stops at the first transform, so documents with
+    # transforms only pay for a short scan.
+    if layer_name is None and root_transformation is None and root.find(".//*[@transform]") is None:
+        # Fast path: without anything hiding or adding elements either, the curves are simply those of every path, in
+        # document order.
+        if (visible_root or draw_hidden) and hasattr(root, "xpath") and not _FAST_PATH_BLOCKERS(root):
+            for element in root.iterdescendants(SVG_PATH_TAG):
+                curves.extend(Path(element.attrib['d'], canvas_height, transform_origin, None).curves)
+            return curves
 
-    # Draw visible elements (Depth-first search)
-    for element in list(root):
+        return _parse_root_no_transform(root, transform_origin, canvas_height, draw_hidden, visible_root)
 
-        # display cannot be overridden by inheritance. Just skip the element
-        display = _has_style(element, "display", "none")
+    # Check if the root is a layer and if we should process it
+    inside_target_layer = _layer_filter(root, layer_name)
+    if inside_target_layer is None:
+        return curves
 
-        if display or element.tag == "{%s}defs" % NAMESPACES["svg"]:
-            continue
+    # Depth-first traversal with an explicit stack instead of recursion. Each entry holds an element and the context
+    # inherited from its parent: (element, visible_root, root_transformation, layer_name, inside_target_layer).
+    # inside_target_layer is True when there is no layer filtering, or when the parent is inside the target layer.
+    # Children are pushed in reverse so they are popped, and drawn, in document order.
+    stack = [(element, visible_root, root_transformation, layer_name, inside_target_layer)
+             for element in reversed(root)]
 
-        transformation = deepcopy(root_transformation) if root_transformation else None
+    while stack:
+        element, visible_root, root_transformation, layer_name, inside_target_layer = stack.pop()
 
+        # Tags are read once; lxml builds a new string on every access
+        tag = element.tag
+
+        visible = _element_visibility(element, tag, visible_root)
+        if visible is None:
+            continue
+
+        # The inherited transformation is only copied when the element adds its own transform. Otherwise it is shared,
+        # which is safe because transformations are only ever modified on the copied branch.
         transform = element.get('transform')
         if transform:
-            transformation = Transformation() if transformation is None else transformation
+            transformation = root_transformation.clone() if root_transformation else Transformation()
             transformation.add_transform(transform)
-
-        # Is the element and it's root not hidden?
-        visible = visible_root and not (_has_style(element, "visibility", "hidden")
-                                        or _has_style(element, "visibility", "collapse"))
-        # Override inherited visibility
-        visible = visible or (_has_style(element, "visibility", "visible"))
+        else:
+            transformation = root_transformation
 
         # If the current element is opaque and visible, draw it
         # Only process paths if we're inside the target layer (or no layer filtering)
-        if (draw_hidden or visible) and (inside_target_layer or layer_name is None):
-            if element.tag == "{%s}path" % NAMESPACES["svg"]:
-                path = Path(element.attrib['d'], canvas_height, transform_origin, transformation)
-                curves.extend(path.curves)
-            else:
-                # Try to convert shape elements (circle, rect, ellipse, etc.) to path data
-                path_data = _shape_to_path_data(element)
-                if path_data:
-                    path = Path(path_data, canvas_height, transform_origin, transformation)
-                    curves.extend(path.curves)
-
-        # Continue the recursion
-        # Recurse if we should (either inside target layer, or searching for target layer)
-        if should_recurse:
-            # When inside the target layer, we need to process all nested elements (groups, paths, etc.)
-            # But we need to be careful: if we encounter another layer inside, we should skip it
-            # unless it's also the target layer (which shouldn't happen in normal SVG structure)
-            # The solution: when inside_target_layer is True, pass None to process all nested elements
-            # When still searching, pass layer_name to continue the search
-            if inside_target_layer:
-                # We're inside the target layer - process all nested elements by passing None
-                # This allows nested groups to be processed without layer filtering
-                curves.extend(parse_root(element, transform_origin, canvas_height, draw_hidden, visible, transformation, None))
-            else:
-                # Still searching for the target layer, continue with layer_name
-                curves.extend(parse_root(element, transform_origin, canvas_height, draw_hidden, visible, transformation, layer_name))
+        if (draw_hidden or visible) and inside_target_layer:
+            _draw_element(element, tag, curves, canvas_height, transform_origin, transformation)
+
+        # Continue the traversal with the element's children.
+        # Inside the target layer all nested elements (groups, paths, etc.) are processed, so layer filtering is
+        # turned off for them. While still searching for the target layer, keep filtering by layer_name.
+        # Without a layer filter the inkscape attributes are never read.
+        if inside_target_layer or layer_name is None:
+            child_layer_name = None
+            child_inside_target_layer = True
+        else:
+            child_layer_name = layer_name
+            child_inside_target_layer = _layer_filter(element, layer_name)
+            if child_inside_target_layer is None:
+                continue
+
+        stack.extend((child, visible, transformation, child_layer_name, child_inside_target_layer)
+                     for child in reversed(element))
 
     # ToDo implement shapes class
     return curves
 
 
+def _element_visibility(element: ElementTree.Element, tag, visible_root: bool) -> Optional[bool]:
+    """
+    Decide whether an element is visible, given the visibility inherited from its parent.
+
+    :return: None if the element and its whole subtree must be skipped (non-rendering elements and display:none),
+    otherwise whether the element is visible. Its children inherit this visibility.
+    """
+    # defs, metadata, etc. are never drawn. They are skipped, along with their whole subtree, before any other work is
+    # done
+    if tag in _NON_RENDERING_TAGS:
+        return None
+
+    # The style attribute is parsed once and shared by the display and visibility checks
+    style = _parse_style(element)
+
+    # display cannot be overridden by inheritance. Just skip the element
+    if _get_style(element, style, "display") == "none":
+        return None
+
+    # Is the element and it's root not hidden?
+    visibility = _get_style(element, style, "visibility")
+    visible = visible_root and not (visibility == "hidden" or visibility == "collapse")
+    # Override inherited visibility
+    return visible or visibility == "visible"
+
+
+def _draw_element(element: ElementTree.Element, tag, curves: List[Curve], canvas_height, transform_origin,
+                  transformation) -> None:
+    """Append the curves of a path or basic shape element to curves. Other elements are ignored."""
+    if tag == SVG_PATH_TAG:
+        path = Path(element.attrib['d'], canvas_height, transform_origin, transformation)
+        curves.extend(path.curves)
+    else:
+        # Try to convert shape elements (circle, rect, ellipse, etc.) to path data
+        path_data = _shape_to_path_data(element)
+        if path_data:
+            path = Path(path_data, canvas_height, transform_origin, transformation)
+            curves.extend(path.curves)
+
+
+def _parse_root_no_transform(root: ElementTree.Element, transform_origin, canvas_height, draw_hidden,
+                             visible_root) -> List[Curve]:
+    """
+    A version of parse_root for documents without any transform attributes and without layer filtering. The traversal
+    is the same, minus transformation and layer tracking; the per-element work is shared with parse_root.
+    """
+    curves = []
+
+    stack = [(element, visible_root) for element in reversed(root)]
+
+    while stack:
+        element, visible_root = stack.pop()
+        tag = element.tag
+
+        visible = _element_visibility(element, tag, visible_root)
+        if visible is None:
+            continue
+
+        if draw_hidden or visible:
+            _draw_element(element, tag, curves, canvas_height, transform_origin, None)
+
+        stack.extend((child, visible) for child in reversed(element))
+
+    return curves
+
+
+def _layer_filter(element: ElementTree.Element, layer_name) -> Optional[bool]:
+    """
+    Decide how an element's children are handled when filtering by layer.
+
+    :return: True if the children should be drawn (no layer filtering, or the element is the target layer), False if
+    they should only be searched for the target layer, and None if they should be skipped entirely (the element is a
+    different layer).
+    """
+    if layer_name is None:
+        return True
+
+    if element.get(INK_GROUPMODE) == "layer":
+        return True if element.get(INK_LABEL) == layer_name else None
+
+    return False
+
+
 def parse_string(svg_string: str, transform_origin=True, canvas_height=None, draw_hidden=False, layer_name=None) -> List[Curve]:
     """
         Recursively parse an svg string into geometric curves. (Wrapper for parse_root)
@@ -260,7 +507,17 @@ def parse_string(svg_string: str, transform_origin=True, canvas_height=None, dra
         :param layer_name: Optional layer name to filter by. If specified, only process paths within layers matching this name.
         :return: A list of geometric curves describing the svg. Use the Compiler sub-module to compile them to gcode.
     """
-    root = ElementTree.fromstring(svg_string)
+    if _lxml:
+        parser = ElementTree.XMLParser(**_LXML_OPTIONS)
+        if isinstance(svg_string, str):
+            # fromstring() rejects str input with an encoding declaration. A str is already decoded, so it is fed to the
+            # parser instead, which ignores the declared encoding.
+            parser.feed(svg_string)
+            root = parser.close()
+        else:
+            root = ElementTree.fromstring(svg_string, parser)
+    else:
+        root = ElementTree.fromstring(svg_string)
     return parse_root(root, transform_origin, canvas_height, draw_hidden, layer_name=layer_name)
 
 
@@ -277,5 +534,51 @@ def parse_file(file_path: str, transform_origin=True, canvas_height=None, draw_h
             :param layer_name: Optional layer name to filter by. If specified, only process paths within layers matching this name.
             :return: A list of geometric curves describing the svg. Use the Compiler sub-module to compile them to gcode.
         """
-    root = ElementTree.parse(file_path).getroot()
+    root = load_root(file_path, layer_name)
     return parse_root(root, transform_origin, canvas_height, draw_hidden, layer_name=layer_name)
+
+
+def _is_layer(element: ElementTree.Element, label=None) -> bool:
+    """Check if an element is an Inkscape layer, optionally with a specific label."""
+    return element.get(INK_GROUPMODE) == "layer" and (label is None or element.get(INK_LABEL) == label)
+
+
+def load_root(file_path: str, layer_name=None) -> ElementTree.Element:
+    """
+    Stream-parse an svg file and return its root element, ready to be passed to parse_root.
+
+    Subtrees that parse_root would never draw are cleared as soon as they have been read, so they don't stay in
+    memory: non-rendering elements (defs, metadata, ...) always, and layers other than layer_name (unless nested in a
+    matching layer) when filtering by layer. Elements are cleared in place rather than removed, since the standard
+    library fallback has no parent pointers.
+
+    :param file_path: The path of the svg file.
+    :param layer_name: Optional layer name that will be passed to parse_root.
+    :return: The root element of the svg.
+    """
+    if _lxml:
+        context = ElementTree.iterparse(file_path, events=("start", "end"), **_LXML_OPTIONS)
+    else:
+        context = ElementTree.iterparse(file_path, events=("start", "end"))
+
+    root = None
+    open_target_layers = 0
+
+    for event, element in context:
+        if event == "start":
+            if root is None:
+                root = element
+            if layer_name is not None and _is_layer(element, layer_name):
+                open_target_layers += 1
+            continue
+
+        if element.tag in _NON_RENDERING_TAGS:
+            element.clear()
+        elif layer_name is not None and _is_layer(element):
+            if element.get(INK_LABEL) == layer_name:
+                open_target_layers -= 1
+            elif open_target_layers == 0:
+                # parse_root skips this layer and everything inside it
+                element.clear()
+
+    return root
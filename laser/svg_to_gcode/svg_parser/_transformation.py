@@ -1,5 +1,4 @@
 import math
-from copy import deepcopy
 
 from svg_to_gcode.geometry import Vector, Matrix, IdentityMatrix
 
@@ -8,7 +7,7 @@ class Transformation:
     """
     The Transformation class handles the parsing and computation behind svg transform attributes.
     """
-    __slots__ = "translation_matrix", "transformation_record", "command_methods"
+    __slots__ = "translation_matrix", "transformation_record"
 
     def __init__(self):
         # Fancy matrix used for affine transformations (translations and linear transformations)
@@ -16,7 +15,9 @@ class Transformation:
 
         self.transformation_record = []
 
-        self.command_methods = {
+    @property
+    def command_methods(self):
+        return {
                 "matrix": self.add_matrix,
                 "translate": self.add_translation,
                 "scale": self.add_scale,
@@ -32,10 +33,15 @@ class Transformation:
         return f"Transformation({transformations})"
 
     def __deepcopy__(self, memodict={}):
-        copy = Transformation()
-        copy.translation_matrix = deepcopy(self.translation_matrix)
+        return self.clone()
 
-        return copy
+    def clone(self) -> "Transformation":
+        """Return an independent copy of the transformation, without the overhead of copy.deepcopy."""
+        clone = Transformation.__new__(Transformation)
+        clone.translation_matrix = self.translation_matrix.copy()
+        clone.transformation_record = list(self.transformation_record)
+
+        return clone
 
     def add_transform(self, transform_string: str):
         transformations = transform_string.split(')')
@@ -0,0 +1,71 @@
+"""Tests for laser._fastgcode: the Numba kernel must format moves exactly like the Python formatter."""
+
+import random
+import unittest
+from unittest import mock
+
+from laser import _fastgcode
+from laser._fastgcode import MIN_BATCH_SIZE, format_moves, format_moves_python
+
+KERNEL = _fastgcode._load_kernel()
+
+
+def _pad(values):
+    """Repeat values until there are enough for the kernel to be used."""
+    values = list(values)
+    return (values * (MIN_BATCH_SIZE // len(values) + 1))[:max(len(values), MIN_BATCH_SIZE)]
+
+
+class FormatMovesPythonTest(unittest.TestCase):
+
+    def test_matches_percent_formatting(self):
+        self.assertEqual(format_moves_python("G1", [1.5, -2.25], [0.0, 3.125], 3),
+                         "G1 X1.500 Y0.000;\nG1 X-2.250 Y3.125;")
+
+    def test_disabled_kernel_is_not_loaded(self):
+        with mock.patch.object(_fastgcode, "USE_NUMBA", False), \
+                mock.patch.object(_fastgcode, "_load_kernel") as load_kernel:
+            xs = _pad([0.5])
+            self.assertEqual(format_moves("G0", xs, xs, 2), format_moves_python("G0", xs, xs, 2))
+            load_kernel.assert_not_called()
+
+
+@unittest.skipIf(KERNEL is None, "Numba is not installed")
+class FormatMovesKernelTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(_fastgcode, "USE_NUMBA", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_same(self, xs, ys, precision, command="G1"):
+        xs, ys = _pad(xs), _pad(ys)
+        self.assertEqual(format_moves(command, xs, ys, precision), format_moves_python(command, xs, ys, precision))
+
+    def test_ties_round_half_to_even(self):
+        # Exactly representable halves, and decimal "halves" that are slightly above or below in binary
+        values = [0.5, 1.5, 2.5, -0.5, -2.5, 0.125, 0.375, 2.675, 1.005, 0.0005, 1.0000005]
+        for precision in (0, 1, 2, 3, 6):
+            self.assert_same(values, list(reversed(values)), precision)
+
+    def test_negative_zero_and_tiny_negatives(self):
+        values = [-0.0, 0.0, -1e-300, -1e-7, -4e-7, -5e-7, -6e-7, -0.4, -0.5, -0.6]
+        for precision in (0, 1, 6):
+            self.assert_same(values, values, precision)
+
+    def test_precision_zero(self):
+        self.assert_same([0.4, 0.5, 0.6, 1.5, 2.5, 99.5, -99.5, 12345.49], [7.0] * 8, 0)
+
+    def test_random_coordinates(self):
+        rng = random.Random(0)
+        for precision in (0, 2, 3, 6):
+            xs = [rng.uniform(-1000, 1000) for _ in range(500)]
+            ys = [rng.choice([rng.uniform(-1, 1), rng.randint(-100, 100) / 8]) for _ in range(500)]
+            self.assert_same(xs, ys, precision, command="G0")
+
+    def test_out_of_range_values_fall_back(self):
+        self.assert_same([float("inf"), float("nan"), 1e300], [0.0, 1.0, 2.0], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()